@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from functools import cached_property
 from channel import Channel
 from common import os, load_dotenv
 
@@ -30,12 +31,18 @@ class AffiliateProgram(ABC):
         self.llm_service = LlmService()
         self.media_service = MediaService()
         self.aws_service = AWSService()
-        self.pinterest_service = PinterestService()
         self.wordpress = self.init_wordpress_service()
-        self.channel_service_map: dict[ChannelName, Channel] = {
-            ChannelName.WORDPRESS.value: self.wordpress,
-            ChannelName.PINTEREST.value: self.pinterest_service,
-        }
+
+    @cached_property
+    def pinterest_service(self) -> PinterestService:
+        # Constructed on first use, as it validates/refreshes the access token over the network
+        return PinterestService()
+
+    def get_channel_service(self) -> Channel:
+        if self.CHANNEL == ChannelName.PINTEREST.value:
+            return self.pinterest_service
+
+        return self.wordpress
 
     @abstractmethod
     def get_affiliate_links(self) -> list[AffiliateLink]:
@@ -80,7 +87,7 @@ class AffiliateProgram(ABC):
 
     def create_content(self, affiliate_links: list[AffiliateLink]) -> list[UsedLink]:
         create_links: list[UsedLink] = []
-        channel_service = self.channel_service_map[self.CHANNEL]
+        channel_service = self.get_channel_service()
 
         for link in affiliate_links:
             try:
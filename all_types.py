@@ -26,7 +26,7 @@ class BaseType:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class AffiliateLink:
     url: str
     product_title: str
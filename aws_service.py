@@ -1,6 +1,6 @@
 from datetime import datetime
 import io
-import json
+import orjson
 import boto3
 from botocore.config import Config
 from typing import Optional, Tuple
@@ -77,8 +77,8 @@ class AWSService:
             # Validate JSON if specified
             if file_format == "json":
                 try:
-                    json.loads(content)
-                except json.JSONDecodeError as e:
+                    orjson.loads(content)
+                except orjson.JSONDecodeError as e:
                     self.logger_service.error(
                         f"Invalid JSON content in s3://{self.bucket_name}/{key}: {str(e)}"
                     )
@@ -88,18 +88,19 @@ class AWSService:
             return self.CACHE[key]
 
         except ClientError as e:
-            if try_count > 0:
+            error_code = e.response["Error"]["Code"]
+            if error_code == "NoSuchKey":
+                # A missing object stays missing, retrying only repeats the GET
+                self.logger_service.warning(
+                    f"S3 object not found: s3://{self.bucket_name}/{key}"
+                )
+                return None, None
+            elif try_count > 0:
                 return self.get_string_from_s3(
                     key=key, file_format=file_format, try_count=try_count - 1
                 )
             else:
-                error_code = e.response["Error"]["Code"]
-                if error_code == "NoSuchKey":
-                    self.logger_service.warning(
-                        f"S3 object not found: s3://{self.bucket_name}/{key}"
-                    )
-                else:
-                    self.logger_service.error(f"Failed to retrieve from S3: {str(e)}")
+                self.logger_service.error(f"Failed to retrieve from S3: {str(e)}")
                 return None, None
         except Exception as e:
             if try_count > 0:
@@ -132,8 +133,8 @@ class AWSService:
             if file_format == "json":
                 # Ensure content is valid JSON
                 try:
-                    json.loads(content)
-                except json.JSONDecodeError:
+                    orjson.loads(content)
+                except orjson.JSONDecodeError:
                     self.logger_service.error("Invalid JSON content provided")
                     return False
                 buffer = io.BytesIO(content.encode("utf-8"))
@@ -170,7 +171,7 @@ class AWSService:
             return []
 
         try:
-            used_links = json.loads(content)  # Deserialize JSON to list
+            used_links = orjson.loads(content)  # Deserialize JSON to list
             # Verify it's a list of strings
             if not isinstance(used_links, list) or not all(
                 isinstance(item, str) for item in used_links
@@ -180,14 +181,14 @@ class AWSService:
                 )
                 return []
             return used_links
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             self.logger_service.error(f"Failed to parse JSON from used_links: {str(e)}")
             return []
 
     def add_used_affiliate_links(self, links: list[str]) -> list[str]:
         try:
             existing_links = self.get_used_affiliate_links()
-            content = json.dumps(existing_links + links)
+            content = orjson.dumps(existing_links + links).decode()
             success = self.upload_string_to_s3(
                 content=content,
                 key=self.USED_LINK_KEY,
@@ -198,6 +199,38 @@ class AWSService:
             self.logger_service.error(f"Error writing affiliate link to S3: {str(e)}")
             return False
 
+    def get_dict_from_s3(self, key: str) -> dict:
+        """
+        Retrieve a JSON object stored in S3 as a dict.
+        Returns an empty dict if the object is missing or invalid.
+        """
+        content, _ = self.get_string_from_s3(key=key, file_format="json")
+
+        if content is None:
+            return {}
+
+        try:
+            data = orjson.loads(content)
+            if not isinstance(data, dict):
+                self.logger_service.error(f"Invalid format for {key}: not an object")
+                return {}
+            return data
+        except orjson.JSONDecodeError as e:
+            self.logger_service.error(f"Failed to parse JSON from {key}: {str(e)}")
+            return {}
+
+    def upload_dict_to_s3(self, key: str, data: dict) -> bool:
+        """
+        Upload a dict to S3 as a JSON object, replacing the cached copy.
+        """
+        content = orjson.dumps(data).decode()
+        success = self.upload_string_to_s3(content=content, key=key, file_format="json")
+
+        if success:
+            self.CACHE.pop(key, None)
+
+        return success
+
     def clear_used_affiliate_links(self) -> bool:
         """
         Clear all used affiliate links by deleting the S3 object.
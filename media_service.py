@@ -125,6 +125,26 @@ class MediaService:
 
         return drawn_images
 
+    def get_image_urls_batch(
+        self,
+        query_limits: dict[str, int],
+        size: str = "original",
+    ) -> dict[str, list[str]]:
+        """
+        Fetch unused image URLs for several queries up front, one lookup per distinct query.
+
+        Args:
+            query_limits (dict[str, int]): Number of images to fetch for each search query.
+            size (str): Image size (e.g., 'original', 'large').
+
+        Returns:
+            dict[str, list[str]]: Image URLs keyed by the queries as given.
+        """
+        return {
+            query: self.get_image_urls(query=query, limit=limit, size=size)
+            for query, limit in query_limits.items()
+        }
+
     def add_used_affiliate_links(self, used_links: list[UsedLink] = []) -> None:
         """
         Write an affiliate link to AWS S3
@@ -179,10 +199,13 @@ class MediaService:
             if not used_links:
                 return affiliate_links
 
+            # Used links are stored as "{url} - {post_id}", index their URLs once
+            used_urls = {used_link.split(" - ")[0] for used_link in used_links}
+
             for link in affiliate_links:
                 formatted_link = self.get_formatted_link(url=link.url)
 
-                if not any(formatted_link in used_link for used_link in used_links):
+                if formatted_link not in used_urls:
                     unused_links.append(link)
         except Exception as e:
             self.logger.error(f"Error reading affiliate links file: {str(e)}")
@@ -1,9 +1,17 @@
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 import csv
+import heapq
 from datetime import datetime, timedelta
-from urllib.parse import urlencode
+from operator import itemgetter
+from urllib.parse import quote, urlencode
 import uuid
+import orjson
 import requests
-from typing import Dict, List, Any, Optional
+from requests.adapters import HTTPAdapter
+import threading
+import time
+from typing import Callable, Dict, List, Any, Optional
 
 from all_types import AffiliateLink, CreateChannelResponse, Pin, UsedLink, WordpressPost
 from channel import Channel
@@ -11,13 +19,43 @@ from constants import PROMPT_SPLIT_JOINER
 from enums import PinterestTrendType
 
 from common import os, load_dotenv, requests
-from utils import get_content_with_max_length
+from utils import (
+    get_content_with_max_length,
+    get_with_retry,
+    rate_limited,
+    to_singular,
+)
 
 
 class PinterestService(Channel):
-    SKIP_KEYWORDS = ["outfit ideas", "hair styles"]
+    SKIP_KEYWORDS = frozenset(["outfit ideas", "hair styles"])
     TITLE_LIMIT = 100
+    CACHE_TTL_SEC = 300  # Freshness window for cached boards, pins and trends
+    CSV_BUFFER_SIZE = 1024 * 1024  # Write buffer for bulk pin CSV files
+    PAGE_SIZE = 250  # Largest page Pinterest allows when listing pins and boards
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD"])  # Safe to replay on any failure
+    RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+    MAX_WORKERS = 8  # Concurrent link workers for bulk create (I/O bound LLM/API calls)
+    # S3 keys persisting query_keywords_map and title_description_map across runs
+    KEYWORDS_CACHE_KEY = "pinterest_query_keywords"
+    DESCRIPTIONS_CACHE_KEY = "pinterest_title_descriptions"
+    DESCRIPTIONS_CACHE_LIMIT = 500  # Most recent titles kept in title_description_map
+    persisted_maps_loaded = False  # Load the persisted maps from S3 once per process
     query_keywords_map: dict[str, list[str]] = {}
+    title_description_map: dict[str, str] = {}
+    trends_map: dict[tuple[int, tuple[str, ...]], tuple[float, list[str]]] = (
+        {}
+    )  # (limit, include_keywords) -> (fetched at, trends)
+    description_lock = threading.Lock()
+    token_checked_at_map: dict[str, float] = (
+        {}
+    )  # Authorization header -> last valid check
+    token_expires_at_map: dict[str, float] = (
+        {}
+    )  # Authorization header -> expiry of a refreshed token
+    # Latest tokens, shared so later instances start from a refreshed/rotated pair
+    access_token: Optional[str] = None
+    refresh_token: Optional[str] = None
 
     def __init__(
         self,
@@ -27,17 +65,67 @@ class PinterestService(Channel):
     ):
         super().__init__()
         self.base_url = "https://api.pinterest.com/v5"
+        self.boards_url = f"{self.base_url}/boards"
+        self.pins_url = f"{self.base_url}/pins"
+        self.user_account_url = f"{self.base_url}/user_account"
+        self.oauth_token_url = f"{self.base_url}/oauth/token"
+        self.trends_url = f"{self.base_url}/trends/keywords/US/top"
+        self._app_id = os.getenv("PINTEREST_APP_ID")
+        self._app_secret = os.getenv("PINTEREST_APP_SECRET")
+        if PinterestService.access_token is None:
+            PinterestService.access_token = os.getenv("PINTEREST_ACCESS_TOKEN")
+        if PinterestService.refresh_token is None:
+            PinterestService.refresh_token = os.getenv("PINTEREST_REFRESH_TOKEN")
         self.headers = {
-            "Authorization": f"Bearer {os.getenv('PINTEREST_ACCESS_TOKEN')}",
+            "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json",
         }
 
+        # Reuse connections (keep-alive) across all Pinterest API calls
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # No adapter-level retries, _request owns the retry policy
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
         # Bulk create config
         self.BULK_CREATE_LIMIT = bulk_create_limit
         self.ALL_PUBLISH_DELAY_MIN = (
             all_publish_delay_min  # Publish all pins after X min
         )
         self.PUBLISH_INCREMENT_MIN = publish_increment_min  # Publish pin with X min apart to avoid potential spam flag from Pinterest
+        # Slow calls (board creation, keyword generation) in flight, keyed by what they produce
+        self._in_flight_lock = threading.Lock()
+        self._in_flight: dict[tuple[str, str], Future] = {}
+
+        # Reuse keywords and descriptions generated by previous runs
+        self._persisted_maps = {
+            self.KEYWORDS_CACHE_KEY: self.query_keywords_map,
+            self.DESCRIPTIONS_CACHE_KEY: self.title_description_map,
+        }
+        self._unsaved_keys: set[str] = set()
+
+        if not PinterestService.persisted_maps_loaded:
+            for key, persisted_map in self._persisted_maps.items():
+                persisted_map.update(
+                    self.media_service.aws_service.get_dict_from_s3(key=key)
+                )
+
+            with self.description_lock:
+                self._trim_descriptions()
+
+            PinterestService.persisted_maps_loaded = True
+
+        # Boards (lowercased name -> ID) and pins, refetched after CACHE_TTL_SEC
+        self._boards_cache: Optional[dict[str, str]] = None
+        self._boards_cached_at: Optional[float] = None
+        self._pins_cache: Optional[list[Pin]] = None
+        self._pins_cached_at: Optional[float] = None
+        self._pin_index: tuple[frozenset[str], frozenset[str]] = (
+            frozenset(),
+            frozenset(),
+        )
 
         # Check token validity and refresh if necessary
         if not self.is_token_valid():
@@ -45,23 +133,63 @@ class PinterestService(Channel):
             if not self.refresh_access_token():
                 self.logger.error("Failed to refresh access token.")
 
-    def get_category_counts(
-        self,
-        pin_sources: List[AffiliateLink | WordpressPost],
-    ) -> dict[str, int]:
-        count_dict = {}
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a request on the shared session, the single retry policy for Pinterest calls.
+        GET and HEAD are retried with backoff on connection errors, timeouts, 429 and 5xx responses.
+        Writes are retried only on 429, since a dropped connection or 5xx may follow a committed write
+        and replaying it would duplicate pins/boards or reuse a rotated refresh token.
+        Raises requests.RequestException once retries run out, other responses are returned as is.
+        """
+        if method.upper() in self.IDEMPOTENT_METHODS:
+            return self._request_idempotent(method, url, **kwargs)
+
+        return self._request_write(method, url, **kwargs)
+
+    @get_with_retry(
+        max_retries=3,
+        initial_delay=1.0,
+        max_delay=30.0,
+        retry_on_exceptions=(
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.HTTPError,
+        ),
+    )
+    def _request_idempotent(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self._send(method, url, self.RETRY_STATUS_CODES, **kwargs)
+
+    @get_with_retry(
+        max_retries=3,
+        initial_delay=1.0,
+        max_delay=30.0,
+        retry_on_exceptions=(requests.HTTPError,),
+    )
+    def _request_write(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self._send(method, url, frozenset([429]), **kwargs)
+
+    @rate_limited(max_calls=90)  # Stay under Pinterest's 100 requests/second per user
+    def _send(
+        self, method: str, url: str, retry_status_codes: frozenset[int], **kwargs
+    ) -> requests.Response:
+        # Raises HTTPError for retryable statuses, the calling retry wrapper owns the backoff
+        response = self.session.request(method, url, **kwargs)
+
+        if response.status_code in retry_status_codes:
+            response.raise_for_status()
 
-        for source in pin_sources:
-            for category in source.categories:
-                if category not in count_dict:
-                    count_dict[category] = 0
-                count_dict[category] += 1
+        return response
 
-        return count_dict
+    def _json(self, response: requests.Response) -> Any:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            # Keep raising a RequestException subclass like response.json() does
+            raise requests.JSONDecodeError(str(e), e.doc, e.pos)
 
     def get_bulk_create_from_affiliate_links_csv(
         self, affiliate_links: List[AffiliateLink], skipUsedCheck: bool = False
-    ):
+    ) -> str:
         unused_links = (
             affiliate_links
             if skipUsedCheck
@@ -71,33 +199,52 @@ class PinterestService(Channel):
         )
 
         if not unused_links:
-            return self.logger.info(f"No unused affiliate links.")
+            self.logger.info("No unused affiliate links.")
+            return ""
 
-        csv_data = []
-        all_pins = self.get_pins()
-        pin_titles = [pin.title for pin in all_pins]
-        pin_links = [pin.link for pin in all_pins]
+        pin_titles, pin_links = self.get_pin_index()
 
-        for i, affiliate_link in enumerate(unused_links):
-            if len(csv_data) >= self.BULK_CREATE_LIMIT:
-                break
+        # Drop duplicate and already pinned URLs before any title/LLM/API work is spent on them
+        seen_urls: set[str] = set()
+        candidate_links = []
+
+        for link in unused_links:
+            if link.url in pin_links:
+                self.logger.info(
+                    f"Affiliate link '{link.url}' already has a pin, skipping."
+                )
+            elif link.url not in seen_urls:
+                seen_urls.add(link.url)
+                candidate_links.append(link)
+
+        csv_data = []
+        seen_titles: set[str] = set()
+        seen_titles_lock = threading.Lock()
+        self._warm_boards_map()
 
+        def _build_row(
+            i: int, affiliate_link: AffiliateLink
+        ) -> Optional[Dict[str, Any]]:
+            """
+            Runs the title/LLM/API work for one link in a worker thread.
+            Returns the CSV row, or None if the link is skipped.
+            """
             try:
                 title = self.get_title(
                     affiliate_link=affiliate_link, limit=self.TITLE_LIMIT
                 )
                 link = affiliate_link.url
-                csv_titles = [row["Title"] for row in csv_data]
 
-                if title in csv_titles:
-                    self.logger.info(f"'{title}' already in CSV, skipping.")
-                    continue
+                if title in pin_titles:
+                    self.logger.info(f"'{title}' already has a pin, skipping.")
+                    return None
 
-                if title in pin_titles or link in pin_links:
-                    self.logger.info(
-                        f"Affiliate link '{link}' already has a pin, skipping."
-                    )
-                    continue
+                # Reserve the title so concurrent workers do not build duplicates
+                with seen_titles_lock:
+                    if title in seen_titles:
+                        self.logger.info(f"'{title}' already in CSV, skipping.")
+                        return None
+                    seen_titles.add(title)
 
                 category = (
                     affiliate_link.categories[0]
@@ -118,75 +265,94 @@ class PinterestService(Channel):
                 )
 
                 if not data_row:
-                    continue
+                    with seen_titles_lock:
+                        seen_titles.discard(title)
+                    return None
 
                 self.logger.info(
                     f"Prepared csv pin data - Title: {title}, Link: {link}"
                 )
-
-                csv_data.append(data_row)
+                return data_row
             except Exception as e:
                 self.logger.error(
                     f"Error bulk create for link {affiliate_link.url}: {e}"
                 )
-                continue
+                return None
+
+        # Build rows concurrently in waves sized to the remaining limit, so skipped
+        # links are backfilled without doing work beyond BULK_CREATE_LIMIT
+        pending_links = list(enumerate(candidate_links))
+
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            while pending_links and len(csv_data) < self.BULK_CREATE_LIMIT:
+                batch_size = self.BULK_CREATE_LIMIT - len(csv_data)
+                batch = pending_links[:batch_size]
+                pending_links = pending_links[batch_size:]
+                data_rows = executor.map(lambda args: _build_row(*args), batch)
+                csv_data += [data_row for data_row in data_rows if data_row]
 
+        self._save_persisted_maps()
         csv_file_paths = self.batch_generate_csv(csv_data)
 
         if csv_file_paths:
-            used_links = [
-                UsedLink(url=link.url) for link in affiliate_links[: len(csv_data)]
-            ]
+            # Record the links that made it into the CSV, in one S3 write
+            used_links = [UsedLink(url=row["Link"]) for row in csv_data]
             self.media_service.add_used_affiliate_links(used_links=used_links)
             return f"CSV generation succeeded. Generated files: {', '.join(csv_file_paths)}"
         else:
             return "CSV generation failed for affiliate links."
 
     def generate_csv(
-        self, csv_data: List[Dict[str, Any]], file_suffix: Optional[str] = None
+        self,
+        csv_data: List[Dict[str, Any]],
+        csv_file_path: str,
+        is_video: Optional[bool] = None,
     ) -> str:
         """
         Generates a CSV file for bulk pin creation with Pinterest-compatible headers.
+        Pass is_video when the rows are already split by media type to skip re-checking them.
         Returns the file path or empty string on failure.
         """
         if not csv_data:
             self.logger.info("No valid pin data to write to CSV.")
             return ""
 
-        video_rows = [row for row in csv_data if row.get("Video URL", None) is not None]
-        image_rows = [row for row in csv_data if row.get("Video URL", None) is None]
-        all_videos = len(video_rows) == len(csv_data)
-        all_images = len(image_rows) == len(csv_data)
-
-        if all([not all_videos, not all_images]):
-            self.logger.warning(
-                "Mix of video and image pins detected, not generating CSV."
+        if is_video is None:
+            video_count = sum(
+                row.get("Video URL", None) is not None for row in csv_data
             )
-            return ""
+
+            if 0 < video_count < len(csv_data):
+                self.logger.warning(
+                    "Mix of video and image pins detected, not generating CSV."
+                )
+                return ""
+
+            is_video = video_count == len(csv_data)
 
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            csv_file_path = (
-                f"bulk_pins_{timestamp}{f"_{file_suffix}" if file_suffix else ""}.csv"
-            )
+            fieldnames = [
+                "Title",
+                "Pinterest board",
+                "Description",
+                "Link",
+                "Publish date",
+                "Keywords",
+            ]
+            fieldnames += ["Video URL", "Thumbnail URL"] if is_video else ["Media URL"]
+
+            # Stream rows straight into the file buffer rather than a second in-memory copy
             with open(
-                csv_file_path, mode="w", newline="", encoding="utf-8"
+                csv_file_path,
+                mode="w",
+                newline="",
+                encoding="utf-8",
+                buffering=self.CSV_BUFFER_SIZE,
             ) as csv_file:
-                fieldnames = [
-                    "Title",
-                    "Pinterest board",
-                    "Description",
-                    "Link",
-                    "Publish date",
-                    "Keywords",
-                ]
-                fieldnames += (
-                    ["Video URL", "Thumbnail URL"] if all_videos else ["Media URL"]
-                )
-                writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-                writer.writeheader()
-                for row in csv_data:
-                    writer.writerow(row)
+                # csv.writer over values pulled in field order skips DictWriter's per-row key validation
+                writer = csv.writer(csv_file)
+                writer.writerow(fieldnames)
+                writer.writerows(map(itemgetter(*fieldnames), csv_data))
             self.logger.info(f"CSV file created successfully: {csv_file_path}")
             return csv_file_path
         except Exception as e:
@@ -194,7 +360,10 @@ class PinterestService(Channel):
             return ""
 
     def get_create_board(self, category: str) -> dict[str, str]:
-        id = self._get_board_id(category)
+        # Single flight per name so concurrent bulk-create workers cannot create the same board twice
+        id = self._single_flight(
+            ("board", category.lower()), lambda: self._get_board_id(category)
+        )
         print("board id", id)
         return {"title": category, "id": id}
 
@@ -220,14 +389,14 @@ class PinterestService(Channel):
             + timedelta(minutes=self.ALL_PUBLISH_DELAY_MIN + publish_delay_min)
         ).strftime("%Y-%m-%d %H:%M:%S")
         description = self.get_description(title=title)
-        keywords = self.query_keywords_map.get(category, []) or self.get_keywords(
-            affiliate_link=AffiliateLink(
-                url=link, product_title=title, categories=[category]
-            )
+        keywords = self.query_keywords_map.get(category, []) or self._single_flight(
+            ("keywords", category),
+            lambda: self._get_category_keywords(
+                category=category, title=title, link=link
+            ),
         )
-        self.query_keywords_map[category] = keywords
         board = self.get_create_board(category=category)
-        base_data = {
+        data = {
             "Title": title,
             "Pinterest board": board["title"].title(),
             "Description": description,
@@ -237,19 +406,59 @@ class PinterestService(Channel):
         }
 
         if video_url:
-            data = {
-                **base_data,
-                "Video URL": video_url,
-                "Thumbnail URL": thumbnail_url,
-            }
+            data["Video URL"] = video_url
+            data["Thumbnail URL"] = thumbnail_url
         else:
-            data = {
-                **base_data,
-                "Media URL": thumbnail_url,
-            }
+            data["Media URL"] = thumbnail_url
 
         return data
 
+    def _get_category_keywords(self, category: str, title: str, link: str) -> list[str]:
+        # Re-check the cache, a worker that just finished may have filled it
+        keywords = self.query_keywords_map.get(category, [])
+
+        if keywords:
+            return keywords
+
+        keywords = self.get_keywords(
+            affiliate_link=AffiliateLink(
+                url=link, product_title=title, categories=[category]
+            )
+        )
+
+        # get_keywords falls back to the category itself when the model call fails, and may
+        # return nothing if every keyword was filtered out. Keep both out of the persisted
+        # map so the category is regenerated next time
+        if keywords and keywords != [category]:
+            self.query_keywords_map[category] = keywords
+            self._unsaved_keys.add(self.KEYWORDS_CACHE_KEY)
+
+        return keywords
+
+    def _single_flight(self, key: tuple[str, str], func: Callable[[], Any]) -> Any:
+        """
+        Runs func once for concurrent callers sharing key, the others wait for its result.
+        Only the bookkeeping is locked, so slow calls for different keys run in parallel.
+        """
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            is_owner = future is None
+
+            if is_owner:
+                future = Future()
+                self._in_flight[key] = future
+
+        if is_owner:
+            try:
+                future.set_result(func())
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._in_flight_lock:
+                    del self._in_flight[key]
+
+        return future.result()
+
     def get_bulk_create_from_posts_csv(
         self, posts: List[WordpressPost], limit: Optional[int] = None
     ) -> str:
@@ -257,44 +466,58 @@ class PinterestService(Channel):
         Generates a CSV for bulk creating pins from WordPress posts without pins.
         Returns the CSV file path or empty string if no pins are needed or an error occurs.
         """
-        all_pins = self.get_pins()
-        pin_titles = [pin.title for pin in all_pins]
-        pin_links = [pin.link for pin in all_pins]
-        posts_with_no_pins = [
-            post
-            for post in posts
-            if post.link not in pin_links and post.title not in pin_titles
-        ]
+        pin_titles, pin_links = self.get_pin_index()
+        # Drop pinned posts and repeated titles up front so the limit only counts new pins
+        seen_titles: set[str] = set()
+        posts_with_no_pins = []
+
+        for post in posts:
+            if (
+                post.link not in pin_links
+                and post.title not in pin_titles
+                and post.title not in seen_titles
+            ):
+                seen_titles.add(post.title)
+                posts_with_no_pins.append(post)
 
         if not posts_with_no_pins:
             self.logger.info("All posts already have corresponding pins.")
             return ""
 
         csv_data = []
-        category_counts = self.get_category_counts(pin_sources=posts_with_no_pins)
-        used_thumbnail_urls = []
+        effective_limit = min(limit or self.BULK_CREATE_LIMIT, self.BULK_CREATE_LIMIT)
+        self._warm_boards_map()
+        # Prepare content for the posts expected to fill the batch, later posts only back fill failed rows
+        posts_to_prefetch = posts_with_no_pins[:effective_limit]
+        # Generate descriptions concurrently so the row loop reads them from the cache
+        self.get_descriptions(titles=[post.title for post in posts_to_prefetch])
+        # Count categories once for the image search
+        category_counts = Counter(
+            self._get_post_category(post) for post in posts_to_prefetch
+        )
+        # One image search per category instead of one per post
+        category_image_urls = {
+            category: deque(image_urls)
+            for category, image_urls in self.media_service.get_image_urls_batch(
+                query_limits=category_counts
+            ).items()
+        }
 
-        for i, post in enumerate(posts_with_no_pins):
-            if len(csv_data) >= limit or self.BULK_CREATE_LIMIT:
+        for post in posts_with_no_pins:
+            if len(csv_data) >= effective_limit:
                 break
 
             try:
                 title = post.title
-                csv_titles = [row["Title"] for row in csv_data]
-
-                if title in csv_titles:
-                    self.logger.info(f"'{title}' already in CSV, skipping.")
-                    continue
-
-                category = post.categories[0].name if post.categories else "Others"
                 link = post.link
-                image_urls = self.media_service.get_image_urls(
-                    query=category,
-                    limit=category_counts[category],
-                )
-                image_urls = [
-                    url for url in image_urls if url not in used_thumbnail_urls
-                ]
+                category = self._get_post_category(post)
+                image_urls = category_image_urls.get(category)
+
+                if not image_urls:
+                    # Back filled posts may need more images than were fetched up front
+                    image_urls = category_image_urls[category] = deque(
+                        self.media_service.get_image_urls(query=category)
+                    )
 
                 if not image_urls:
                     self.logger.warning(
@@ -307,7 +530,7 @@ class PinterestService(Channel):
                     title=title,
                     category=category,
                     link=link,
-                    publish_delay_min=i * self.PUBLISH_INCREMENT_MIN,
+                    publish_delay_min=len(csv_data) * self.PUBLISH_INCREMENT_MIN,
                     thumbnail_url=thumbnail_url,
                 )
 
@@ -318,18 +541,24 @@ class PinterestService(Channel):
                     f"Prepared CSV pin data - Title: {title}, Link: {link}"
                 )
 
-                used_thumbnail_urls.append(thumbnail_url)
+                # Consume the thumbnail only once its row has been prepared
+                image_urls.popleft()
                 csv_data.append(data_row)
             except Exception as e:
                 self.logger.error(f"Error processing post '{post.title}': {e}")
                 continue
 
-            csv_file_paths = self.batch_generate_csv(csv_data)
+        self._save_persisted_maps()
+        csv_file_paths = self.batch_generate_csv(csv_data)
 
-            if csv_file_paths:
-                return f"CSV generation succeeded. Generated files: {', '.join(csv_file_paths)}"
-            else:
-                return "CSV generation failed for affiliate links."
+        if csv_file_paths:
+            return f"CSV generation succeeded. Generated files: {', '.join(csv_file_paths)}"
+        else:
+            return "CSV generation failed for affiliate links."
+
+    def _get_post_category(self, post: WordpressPost) -> str:
+        # Posts are pinned under their first category's name
+        return post.categories[0].name if post.categories else "Others"
 
     def batch_generate_csv(
         self, csv_data: list[dict[str, str]], chunk_size: int = 5
@@ -344,22 +573,29 @@ class PinterestService(Channel):
             return []
 
         csv_file_paths = []
+        # One timestamp per batch so all its files share a prefix and sort by chunk
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         video_rows = [row for row in csv_data if row.get("Video URL", None) is not None]
         image_rows = [row for row in csv_data if row.get("Video URL", None) is None]
 
-        for csv_data in [video_rows, image_rows]:
+        for is_video, csv_data in [(True, video_rows), (False, image_rows)]:
             if not csv_data:
                 continue
 
-            csv_data_chunks = [
+            media = "video" if is_video else "image"
+
+            # Slice chunks lazily so only the chunk being written is copied
+            csv_data_chunks = (
                 csv_data[i : i + chunk_size]
                 for i in range(0, len(csv_data), chunk_size)
-            ]
+            )
 
             for i, chunk in enumerate(csv_data_chunks):
                 if chunk:
                     csv_file_path = self.generate_csv(
-                        csv_data=chunk, file_suffix=str(i + 1) if i > 0 else None
+                        csv_data=chunk,
+                        csv_file_path=f"bulk_pins_{timestamp}_{media}_{i + 1}.csv",
+                        is_video=is_video,
                     )
                     if csv_file_path:
                         csv_file_paths.append(csv_file_path)
@@ -380,36 +616,29 @@ class PinterestService(Channel):
             limit: Number of top trends to return
             include_keywords: Optional list of keywords to include in the trends results
         """
-        trend_count: Dict[str, int] = {}
+        trends_key = (limit, tuple(sorted(include_keywords)))
+
+        # Shared across instances (and warm Lambda invocations), so entries expire like boards and pins
+        cached_at, cached_trends = self.trends_map.get(trends_key, (None, []))
+
+        if self._is_cache_fresh(cached_at):
+            return cached_trends
+
+        trend_count: Counter[str] = Counter()
 
         def _get_unique_keywords(
             sorted_trends: list[tuple[str, int]],
+            limit: int,
         ) -> list[tuple[str, int]]:
             """
             Process a list of keyword tuples:
             - Filter out keywords that, after removing plural endings ('s' or 'es'), are substrings of other keywords.
             - Keep original keywords in the output, prioritizing longer terms and higher counts.
+            - Return only the top 'limit' keywords.
             """
             if not sorted_trends:
                 return []
 
-            # Helper function to get singular form for substring comparison
-            def to_singular(keyword: str) -> str:
-                words = keyword.split()
-                singular_words = []
-                for word in words:
-                    if word.endswith("es") and len(word) > 2 and word[-3] != "i":
-                        singular = word[:-2]  # e.g., designs -> design
-                        singular_words.append(singular)
-                    elif word.endswith("s") and len(word) > 1:
-                        singular = word[:-1]  # e.g., nails -> nail, outfits -> outfit
-                        singular_words.append(
-                            word
-                        )  # Keep original for non-plural cases
-                    else:
-                        singular_words.append(word)  # e.g., hair, braid
-                return " ".join(singular_words)
-
             # Step 1: Create a list with original keywords and their singular forms for comparison
             processed = [
                 (keyword, count, to_singular(keyword))
@@ -417,18 +646,19 @@ class PinterestService(Channel):
             ]
 
             # Step 2: Filter out keywords whose singular form is a substring of another keyword's singular form
-            unique = []
+            # Kept as (keyword, count, singular) so singular forms are computed once per keyword
+            unique: list[tuple[str, int, str]] = []
+            unique_keywords: set[str] = set()
             # Sort by length of original keyword (descending) and count (descending)
             processed = sorted(processed, key=lambda x: (-len(x[0].split()), -x[1]))
 
             for orig_kw, count, singular_kw in processed:
                 # Skip duplicates (based on original keyword)
-                if any(orig_kw == existing[0] for existing in unique):
+                if orig_kw in unique_keywords:
                     continue
                 # Skip if this keyword's singular form is a substring of any existing unique keyword's singular form
                 if any(
-                    singular_kw in to_singular(existing[0])
-                    and singular_kw != to_singular(existing[0])
+                    singular_kw in existing[2] and singular_kw != existing[2]
                     for existing in unique
                 ):
                     continue
@@ -437,32 +667,33 @@ class PinterestService(Channel):
                 unique = [
                     existing
                     for existing in unique
-                    if to_singular(existing[0]) not in singular_kw
-                    or to_singular(existing[0]) == singular_kw
+                    if existing[2] not in singular_kw or existing[2] == singular_kw
                 ]
-                unique.append((orig_kw, count))
+                unique.append((orig_kw, count, singular_kw))
+                unique_keywords.add(orig_kw)
+
+            # Top 'limit' by original count (descending) and word count (descending) to match input sorting
+            return [
+                (keyword, count)
+                for keyword, count, _ in heapq.nsmallest(
+                    limit, unique, key=lambda x: (-x[1], -len(x[0].split()))
+                )
+            ]
+
+        # Same query for every trend type; commas are kept literal as the list separator
+        params = {"limit": 20}
+
+        if include_keywords:
+            params["include_keywords"] = ",".join(include_keywords)
 
-            # Sort by original count (descending) and word count (descending) to match input sorting
-            unique = sorted(unique, key=lambda x: (-x[1], -len(x[0].split())))
-            return unique
+        query = urlencode(params, safe=",", quote_via=quote)
 
         def _get_trends(trend_type: PinterestTrendType):
             try:
-                # Build the base URL
-                url = f"{self.base_url}/trends/keywords/US/top/{trend_type}?limit=20"
-
-                # Add include_keywords parameter if provided
-                if include_keywords:
-                    # URL encode each keyword and join with commas
-                    encoded_keywords = [
-                        requests.utils.quote(keyword) for keyword in include_keywords
-                    ]
-                    keywords_param = ",".join(encoded_keywords)
-                    url += f"&include_keywords={keywords_param}"
-
-                response = requests.get(url, headers=self.headers)
+                url = f"{self.trends_url}/{trend_type}"
+                response = self._request("GET", url, params=query)
                 response.raise_for_status()
-                data = response.json()
+                data = self._json(response)
                 trends = data.get("trends", [])
                 trend_names = [trend.get("keyword", None) for trend in trends]
                 return [name for name in trend_names if name is not None]
@@ -470,15 +701,15 @@ class PinterestService(Channel):
                 self.logger.error(f"Error fetching trends: {e}")
                 return []
 
-        for trend_type in PinterestTrendType:
-            trends = _get_trends(trend_type)
-            for trend in trends:
-                trend_count[trend] = trend_count.get(trend, 0) + 1
+        # Trend types are fetched concurrently and merged on the calling thread
+        with ThreadPoolExecutor(max_workers=len(PinterestTrendType)) as executor:
+            trends_by_type = list(executor.map(_get_trends, PinterestTrendType))
 
-        # Remove vague keywords not useful for tags
-        trend_count = {
-            k: v for k, v in trend_count.items() if k not in self.SKIP_KEYWORDS
-        }
+        for trends in trends_by_type:
+            # Skip vague keywords not useful for tags
+            trend_count.update(
+                trend for trend in trends if trend not in self.SKIP_KEYWORDS
+            )
 
         # Sort trends by count (descending) and then by word count (descending) for ties
         sorted_trends = sorted(
@@ -488,21 +719,40 @@ class PinterestService(Channel):
                 -len(x[0].split()),
             ),
         )
-        sorted_trends = _get_unique_keywords(sorted_trends)
+        sorted_trends = _get_unique_keywords(sorted_trends, limit=limit)
 
         # Return the top 'limit' trend names
-        return [trend for trend, _ in sorted_trends[:limit]]
+        top_trends = [trend for trend, _ in sorted_trends]
+
+        if top_trends:
+            self.trends_map[trends_key] = (time.monotonic(), top_trends)
+
+        return top_trends
 
     def is_token_valid(self) -> bool:
-        url = "https://api.pinterest.com/v5/user_account"
+        url = self.user_account_url
+        token = self.headers["Authorization"]
+
+        # Skip the round trip if this token was refreshed or validated recently, e.g. by another instance
+        if time.monotonic() < self.token_expires_at_map.get(token, 0):
+            return True
+
+        if self._is_cache_fresh(self.token_checked_at_map.get(token)):
+            return True
 
         try:
-            response = requests.get(url, headers=self.headers)
+            # HEAD skips the account payload, fall back to GET if the endpoint does not allow it
+            response = self._request("HEAD", url)
+
+            if response.status_code == 405:
+                response = self._request("GET", url)
+
             if response.status_code == 200:
+                self.token_checked_at_map[token] = time.monotonic()
                 return True
             else:
                 self.logger.warning(
-                    f"Token is invalid. Status code: {response.status_code}, Error: {response.json()}"
+                    f"Token is invalid. Status code: {response.status_code}, Error: {response.text or response.reason}"
                 )
                 return False
         except requests.RequestException as e:
@@ -514,19 +764,22 @@ class PinterestService(Channel):
         Refresh the Pinterest access token using the refresh token.
         Updates self.headers with the new access token if successful.
         """
-        url = f"{self.base_url}/oauth/token"
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        url = self.oauth_token_url
+        headers = {
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Authorization": None,  # Drop the session's bearer token for this call
+        }
         data = {
             "grant_type": "refresh_token",
-            "refresh_token": os.getenv("PINTEREST_REFRESH_TOKEN"),
-            "client_id": os.getenv("PINTEREST_APP_ID"),
-            "client_secret": os.getenv("PINTEREST_APP_SECRET"),
+            "refresh_token": self.refresh_token,
+            "client_id": self._app_id,
+            "client_secret": self._app_secret,
         }
 
         try:
-            response = requests.post(url, headers=headers, data=data)
+            response = self._request("POST", url, headers=headers, data=data)
             response.raise_for_status()
-            response_data = response.json()
+            response_data = self._json(response)
             new_access_token = response_data.get("access_token")
             new_refresh_token = response_data.get(
                 "refresh_token"
@@ -534,7 +787,13 @@ class PinterestService(Channel):
 
             if new_access_token:
                 # Update headers with new access token
+                PinterestService.access_token = new_access_token
                 self.headers["Authorization"] = f"Bearer {new_access_token}"
+                self.session.headers["Authorization"] = self.headers["Authorization"]
+                # Trust the new token until shortly before Pinterest says it expires
+                self.token_expires_at_map[self.headers["Authorization"]] = (
+                    time.monotonic() + response_data.get("expires_in", 3600) - 60
+                )
                 self.logger.warning("Access token refreshed successfully.")
             else:
                 self.logger.error(
@@ -543,12 +802,13 @@ class PinterestService(Channel):
                 return False
 
             if new_refresh_token:
+                PinterestService.refresh_token = new_refresh_token
                 self.logger.warning("Refresh token updated.")
 
             return True
         except requests.RequestException as e:
             self.logger.error(
-                f"Error refreshing token: {e} - {e.response.status_code if e.response else "No response"} {e.response.json() if e.response else str(e)}"
+                f"Error refreshing token: {e} - {e.response.status_code if e.response else "No response"} {self._json(e.response) if e.response else str(e)}"
             )
             return False
 
@@ -569,7 +829,7 @@ class PinterestService(Channel):
         state = str(uuid.uuid4())  # Unique state for CSRF protection
         base_url = "https://www.pinterest.com/oauth/"
         params = {
-            "client_id": os.getenv("PINTEREST_APP_ID"),
+            "client_id": self._app_id,
             "redirect_uri": redirect_uri,
             "response_type": "code",
             "scope": ",".join(scopes),
@@ -577,35 +837,90 @@ class PinterestService(Channel):
         }
         return f"{base_url}?{urlencode(params)}", state
 
+    def _save_persisted_maps(self) -> None:
+        # Upload once per bulk run rather than per generated entry, from the calling thread
+        for key in list(self._unsaved_keys):
+            self._unsaved_keys.discard(key)
+            self.media_service.aws_service.upload_dict_to_s3(
+                key=key, data=dict(self._persisted_maps[key])
+            )
+
+    def _trim_descriptions(self) -> None:
+        # Drop the oldest titles so the shared (and persisted) map stays bounded, call under description_lock
+        while len(self.title_description_map) > self.DESCRIPTIONS_CACHE_LIMIT:
+            del self.title_description_map[next(iter(self.title_description_map))]
+
+    def _is_cache_fresh(self, cached_at: Optional[float]) -> bool:
+        return (
+            cached_at is not None and time.monotonic() - cached_at < self.CACHE_TTL_SEC
+        )
+
+    def _get_all_items(self, url: str) -> list[dict[str, Any]]:
+        """
+        Returns the items of every page of a paginated list endpoint, following bookmarks.
+        Raises requests.RequestException on failure.
+        """
+        items = []
+        params = {"page_size": self.PAGE_SIZE}
+
+        while True:
+            response = self._request("GET", url, params=params)
+            response.raise_for_status()
+            data = self._json(response)
+            items += data.get("items", [])
+            bookmark = data.get("bookmark")
+
+            if not bookmark:
+                return items
+
+            params["bookmark"] = bookmark
+
+    def _load_boards_map(self) -> dict[str, str]:
+        """
+        Returns a map of lowercased board name to board ID.
+        Fetches /boards at most once per CACHE_TTL_SEC, raises requests.RequestException on failure.
+        """
+        if not self._is_cache_fresh(self._boards_cached_at):
+            boards = self._get_all_items(self.boards_url)
+            self._boards_cache = {
+                board["name"].lower(): board["id"] for board in boards
+            }
+            self._boards_cached_at = time.monotonic()
+
+        return self._boards_cache
+
+    def _warm_boards_map(self) -> None:
+        # Fetch boards once before bulk create so each row resolves its board from the map
+        try:
+            self._load_boards_map()
+        except requests.RequestException as e:
+            self.logger.error(f"Error fetching boards: {e}")
+
+    def _invalidate_boards_on_not_found(self, e: requests.RequestException) -> None:
+        # A 404 for a cached board ID means the board was deleted, refetch boards next time
+        if e.response is not None and e.response.status_code == 404:
+            self._boards_cached_at = None
+
     def _get_board_id(self, name: str, get_or_create: bool = True) -> Optional[str]:
         try:
-            url = f"{self.base_url}/boards"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
-            boards = data.get("items", [])
-            board = next(
-                (board for board in boards if board["name"].lower() == name.lower()),
-                None,
-            )
+            board_id = self._load_boards_map().get(name.lower())
 
-            if not board and get_or_create:
+            if not board_id and get_or_create:
                 self.logger.info(f"No board found for the name '{name}', creating one.")
                 return self.create_board(name)
 
-            return board["id"] if board else None
+            return board_id
         except requests.RequestException as e:
             self.logger.error(f"Error fetching boards: {e}")
             return ""
 
     def get_pins(self) -> list[Pin]:
+        if self._is_cache_fresh(self._pins_cached_at):
+            return self._pins_cache
+
         try:
-            url = f"{self.base_url}/pins"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
-            pins = data.get("items", [])
-            return [
+            pins = self._get_all_items(self.pins_url)
+            self._pins_cache = [
                 Pin(
                     id=pin.get("id", ""),
                     board_id=pin.get("board_id", ""),
@@ -615,26 +930,50 @@ class PinterestService(Channel):
                 )
                 for pin in pins
             ]
+            self._pins_cached_at = time.monotonic()
+
+            # Index titles and links in a single pass for O(1) duplicate checks
+            pin_titles, pin_links = set(), set()
+            for pin in self._pins_cache:
+                pin_titles.add(pin.title)
+                pin_links.add(pin.link)
+            # Frozen so callers sharing the cached index cannot mutate it
+            self._pin_index = (frozenset(pin_titles), frozenset(pin_links))
+
+            return self._pins_cache
         except requests.RequestException as e:
             self.logger.error(f"Error fetching pins: {e}")
             return []
 
+    def get_pin_index(self) -> tuple[frozenset[str], frozenset[str]]:
+        """
+        Returns the titles and links of existing pins as sets, refreshed along with the pins cache.
+        """
+        if not self.get_pins():
+            return frozenset(), frozenset()
+
+        return self._pin_index
+
     def create_board(self, name: str) -> str:
         """
         Creates a Pinterest board with the given name and optional description.
         Returns the board ID.
         """
         try:
-            url = f"{self.base_url}/boards"
+            url = self.boards_url
             description = self.llm_service.generate_text(
                 f"Create a Pinterest board description based on '{name}' that is SEO friendly, time-agnostic, and suitable for affiliate marketing, return the description only"
             )
             payload = {"name": name, "description": description}
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self._request("POST", url, data=orjson.dumps(payload))
             response.raise_for_status()
 
-            board_id = response.json().get("id", "")
+            board_id = self._json(response).get("id", "")
             self.logger.info(f"New board created: {name} - {board_id}")
+
+            if board_id and self._is_cache_fresh(self._boards_cached_at):
+                self._boards_cache[name.lower()] = board_id
+
             return board_id
         except requests.RequestException as e:
             self.logger.error(f"Error creating board: {e}")
@@ -652,23 +991,24 @@ class PinterestService(Channel):
                 self.logger.info("Cannot create section: No valid board ID found.")
                 return ""
 
-            url = f"{self.base_url}/boards/{board_id}/sections"
+            url = f"{self.boards_url}/{board_id}/sections"
             payload = {"name": section_name}
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self._request("POST", url, data=orjson.dumps(payload))
             response.raise_for_status()
-            section_id = response.json().get("id")
+            section_id = self._json(response).get("id")
             return section_id
         except requests.RequestException as e:
             self.logger.error(f"Error creating board section: {e}")
+            self._invalidate_boards_on_not_found(e)
             return ""
 
     def create(
         self,
         affiliate_link: AffiliateLink,
-    ) -> CreateChannelResponse:
+    ) -> Optional[CreateChannelResponse]:
         """
         Creates a pin on the specified board with the given image/video URL, and optional affiliate link.
-        Returns the pin ID.
+        Returns the created pin, or None on failure.
         """
         try:
             category = affiliate_link.categories[0]
@@ -690,13 +1030,13 @@ class PinterestService(Channel):
 
             if not board_id:
                 self.logger.info("No valid board ID found.")
-                return ""
+                return None
 
             title = self.get_title(
                 affiliate_link=affiliate_link, limit=self.TITLE_LIMIT
             )
             description = self.get_description(title=title)
-            url = f"{self.base_url}/pins"
+            url = self.pins_url
             base_payload = {
                 "board_id": board_id,
                 "title": title,
@@ -728,18 +1068,20 @@ class PinterestService(Channel):
                     "media_source": {"source_type": "image_url", "url": thumbnail_url},
                 }
 
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self._request("POST", url, data=orjson.dumps(payload))
             response.raise_for_status()
-            data = response.json()
+            data = self._json(response)
             id = data.get("id")
             self.logger.info(f"Created pin {id}")
+            self._pins_cached_at = None  # Refetch pins to include the new one
 
             return CreateChannelResponse(id=id)
         except requests.RequestException as e:
             self.logger.error(
-                f"Error creating pin: {e.response.status_code if e.response else 'No response'} - {e.response.json() if e.response else str(e)}"
+                f"Error creating pin: {e.response.status_code if e.response else 'No response'} - {self._json(e.response) if e.response else str(e)}"
             )
-            return ""
+            self._invalidate_boards_on_not_found(e)
+            return None
 
     def get_description(self, title: str) -> str:
         """
@@ -751,6 +1093,12 @@ class PinterestService(Channel):
         Returns:
             str: Description truncated to Pinterest's 500-character limit
         """
+        # Read once, a concurrent trim may evict the title between a check and a lookup
+        description = self.title_description_map.get(title)
+
+        if description is not None:
+            return description
+
         # Pinterest's actual limit is 500 characters
         MAX_LENGTH = 500
         DISCLOSURE = f"\n#affiliate {self.DISCLOSURE}"
@@ -771,6 +1119,10 @@ class PinterestService(Channel):
             description = get_content_with_max_length(description, MAX_LENGTH)
 
             self.logger.info(f"Generated description length: {len(description)} chars")
+            with self.description_lock:
+                self.title_description_map[title] = description
+                self._trim_descriptions()
+
             return description
 
         except Exception as e:
@@ -784,6 +1136,36 @@ class PinterestService(Channel):
 
             return fallback[:MAX_LENGTH]
 
+    def get_descriptions(self, titles: List[str]) -> Dict[str, str]:
+        """
+        Generates descriptions for multiple titles concurrently.
+
+        Args:
+            titles (List[str]): Titles to generate descriptions for
+
+        Returns:
+            Dict[str, str]: Description for each title
+        """
+        new_titles = [
+            title for title in titles if title not in self.title_description_map
+        ]
+
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            descriptions = dict(
+                zip(
+                    titles,
+                    executor.map(
+                        lambda title: self.get_description(title=title), titles
+                    ),
+                )
+            )
+
+        # Only batches persist descriptions, single pins and affiliate rows keep them in memory
+        if any(title in self.title_description_map for title in new_titles):
+            self._unsaved_keys.add(self.DESCRIPTIONS_CACHE_KEY)
+
+        return descriptions
+
 
 if __name__ == "__main__":
     service = PinterestService()
@@ -1,6 +1,8 @@
 import time
 import random
-from functools import wraps
+import threading
+from collections import deque
+from functools import lru_cache, wraps
 from typing import Callable, Any, Optional, Dict
 from constants import PROMPT_SPLIT_JOINER
 
@@ -26,6 +28,24 @@ def get_content_with_max_length(content: str, max_length: int) -> str:
     return "".join(result)
 
 
+@lru_cache(maxsize=4096)
+def to_singular(keyword: str) -> str:
+    """
+    Strips plural endings ('s' or 'es') from each word, for comparing keywords regardless of plurality.
+    """
+    singular_words = []
+
+    for word in keyword.split():
+        if word.endswith("es") and len(word) > 2 and word[-3] != "i":
+            singular_words.append(word[:-2])  # e.g., dresses -> dress
+        elif word.endswith("s") and len(word) > 1:
+            singular_words.append(word[:-1])  # e.g., nails -> nail, outfits -> outfit
+        else:
+            singular_words.append(word)  # e.g., hair, braid
+
+    return " ".join(singular_words)
+
+
 def get_img_element(
     src: str, alt: Optional[str] = "", style: Optional[Dict[str, str]] = None
 ) -> str:
@@ -107,3 +127,41 @@ def get_with_retry(
         return wrapper
 
     return decorator
+
+
+def rate_limited(max_calls: int, period: float = 1.0) -> Callable:
+    """
+    Decorator limiting calls to max_calls per period across threads, using a sliding window.
+
+    Args:
+        max_calls: Maximum number of calls allowed within the window
+        period: Window length in seconds
+
+    Returns:
+        Decorated function that sleeps until a call is allowed
+    """
+
+    def decorator(func: Callable) -> Callable:
+        lock = threading.Lock()
+        call_times: deque[float] = deque()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            # Waiting under the lock lets queued callers through in order
+            with lock:
+                now = time.monotonic()
+
+                while call_times and now - call_times[0] >= period:
+                    call_times.popleft()
+
+                if len(call_times) >= max_calls:
+                    time.sleep(period - (now - call_times[0]))
+                    call_times.popleft()
+
+                call_times.append(time.monotonic())
+
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator